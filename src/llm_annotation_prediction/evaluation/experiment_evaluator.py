@@ -121,8 +121,7 @@ class ExperimentEvaluator(BaseModel):
         print(f"Loading experiment in {self._config.experiment_path}")
         try:
             context_path = Path(self._config.experiment_path) / CONTEXT_FILENAME
-            with open(context_path, encoding="utf-8") as f:
-                context = DataAdapter.validate_json(f.read())
+            context = DataAdapter.validate_json(context_path.read_bytes())
 
             self.publication_evaluators: PublicationEvaluator = {}
             for uuid, trials in context.items():
@@ -24,5 +24,6 @@ Data = Dict[str, List[Context]]
 DataAdapter = TypeAdapter(Data)
 
 Conversation = List[Message]
+ConversationAdapter = TypeAdapter(Conversation)
 Conversations = Dict[str, List[Conversation]]
 ConversationsAdapter = TypeAdapter(Conversations)
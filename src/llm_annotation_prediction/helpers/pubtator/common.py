@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import StrEnum
-from typing import Any, ClassVar, Generic, Type, TypeVar
+from typing import Any, Callable, ClassVar, Generic, Type, TypeVar
 
 from pydantic import BaseModel
 
@@ -23,6 +23,10 @@ class EntityType(StrEnum):
     CELLLINE = "CELLLINE"  # Does not work in FindEntityId
 
 
+# Allowed values for the concept filter in tool descriptions
+ENTITY_TYPE_NAMES: tuple[str, ...] = tuple(e.name for e in EntityType)
+
+
 # I'm not sure if some LLMs have issues with non-programming like function names,
 # so I'll go with the snake_case. We define it with the same name for the FindEntityId
 # tool and the FindIdByPublication Tool to be able to compare them without inadvertently
@@ -70,6 +74,10 @@ class PubtatorStrategy(Generic[PubtatorArguments, PubtatorResults], ABC):
     # The arguments class, which the handler needs to know about
     Arguments: Type[PubtatorArguments]
 
+    # The pydantic-core validator of the arguments class. Subclasses bind it once in
+    # their class body, so tool calls skip the model_validate_json dispatch.
+    _validate_json: Callable[[str], PubtatorArguments]
+
     # Class-wide rate limiter for all Pubtator API calls
     _rate_limiter: ClassVar = RateLimitedQueue[Any](
         name="PubtatorRateLimiter",
@@ -78,11 +86,12 @@ class PubtatorStrategy(Generic[PubtatorArguments, PubtatorResults], ABC):
         initial_rps=2.0,
     )
 
-    def validate_json(self, tool_call: ToolCall) -> PubtatorArguments:
+    @classmethod
+    def validate_json(cls, tool_call: ToolCall) -> PubtatorArguments:
         """
         Validates that the LLM's tool call arguments are in the expected format.
         """
-        return self.Arguments.model_validate_json(tool_call.function.arguments)
+        return cls._validate_json(tool_call.function.arguments)
 
     @classmethod
     @abstractmethod
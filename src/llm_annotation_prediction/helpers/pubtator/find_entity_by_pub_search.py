@@ -60,7 +60,7 @@ find_entity_by_publication_description = FunctionDescription(
             "text": {"type": "string", "description": QUERY_ARGUMENT_DESCRIPTION},
             # "concept": {
             #     "type": "string",
-            #     "enum": [e.name for e in EntityType],  # allowed values from EntityType
+            #     "enum": list(ENTITY_TYPE_NAMES),
             # },
         },
     },
@@ -275,6 +275,7 @@ class FindEntityByPublicationSearchStrategy(
 ):
     tool = find_entity_by_publication_tool
     Arguments = FindEntityByPublicationArguments
+    _validate_json = staticmethod(Arguments.__pydantic_validator__.validate_json)
 
     @classmethod
     async def find_ids(
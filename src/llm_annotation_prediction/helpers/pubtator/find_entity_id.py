@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field, ValidationError, field_validator
 
 from llm_annotation_prediction.helpers.open_router import FunctionDescription, Tool
 from llm_annotation_prediction.helpers.pubtator.common import (
+    ENTITY_TYPE_NAMES,
     PUBTATOR_TOOL_DESCRIPTION,
     PUBTATOR_TOOL_NAME,
     EntityType,
@@ -39,7 +40,7 @@ find_entity_id_description = FunctionDescription(
             },
             "concept": {
                 "type": "string",
-                "enum": [e.name for e in EntityType],  # allowed values from EntityType
+                "enum": list(ENTITY_TYPE_NAMES),
             },
             "limit": {
                 "type": "integer",
@@ -117,6 +118,7 @@ class FindEntityIdStrategy(
 ):
     tool = find_entity_id_tool
     Arguments = FindEntityIdArguments
+    _validate_json = staticmethod(Arguments.__pydantic_validator__.validate_json)
 
     @classmethod
     async def find_ids(cls, arguments: FindEntityIdArguments) -> FindEntityIdResults:
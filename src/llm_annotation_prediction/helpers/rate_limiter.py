@@ -1,17 +1,30 @@
 import asyncio
+import functools
 import logging
+import random
 import time
 from collections import deque
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Deque, Generic, List, TypeVar
-from uuid import uuid4
-
-import aiometer
+from typing import Any, Awaitable, Callable, Deque, Generic, Set, Tuple, TypeVar
 
 T = TypeVar("T")
 AsyncCallable = Callable[..., Awaitable[T]]
 
 
+async def _safe_call(
+    api_call: AsyncCallable[T], args: Tuple[Any, ...]
+) -> T | Exception:
+    """
+    Runs an API call and returns its exception instead of raising it. The exception
+    then ends up in the future of the task instead of being lost in the worker's
+    background task.
+    """
+    try:
+        return await api_call(*args)
+    except Exception as e:
+        return e
+
+
 @dataclass
 class QueuedTask(Generic[T]):
     """Represents a single API call task with retry tracking."""
@@ -21,6 +34,27 @@ class QueuedTask(Generic[T]):
     retry_count: int = 0
 
 
+class StartRateLimiter:
+    """
+    Spaces out the start of calls so they don't exceed a rate in calls per second.
+    Each caller reserves the next free slot, so no lock is needed within the event
+    loop. The rate can be changed at any time and applies to all following
+    reservations.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_start = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the next call may start."""
+        now = time.monotonic()
+        start = max(now, self._next_start)
+        self._next_start = start + 1 / self.rate
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
 class RateLimitedQueue(Generic[T]):
     """
     A dynamic rate limiter that adjusts request rates based on success/failure patterns.
@@ -41,6 +75,8 @@ class RateLimitedQueue(Generic[T]):
         failure_threshold: Failure rate that triggers RPS reduction (0.0-1.0)
         adjustment_size: Additive adjustment for rate changes (> 0)
         adjustment_cooldown: Seconds to wait between rate adjustments
+        retry_base: Base delay in seconds for the exponential retry backoff
+        retry_cap: Maximum delay in seconds between retries
     """
 
     def __init__(
@@ -55,88 +91,106 @@ class RateLimitedQueue(Generic[T]):
         failure_threshold: float = 0.05,
         adjustment_size: float = 0.5,
         adjustment_cooldown: int = 5,
+        retry_base: float = 0.1,
+        retry_cap: float = 30.0,
     ):
         self._name = name
         self._logger = logging.getLogger(name)
         self._max_retries = max_retries
+        self._retry_base = retry_base
+        self._retry_cap = retry_cap
 
         # Rate limiting state
         self._min_rps = min_rps
         self._max_rps = max_rps
         self._current_rps = max(min_rps, min(max_rps, initial_rps))
+        self._limiter = StartRateLimiter(self._current_rps)
         self._window_size = window_size
         self._success_threshold = success_threshold
         self._failure_threshold = failure_threshold
         self._adjustment_size = adjustment_size
         self._adjustment_cooldown = adjustment_cooldown
         self._history: Deque[bool] = deque(maxlen=window_size)
-        self._last_adjustment = time.monotonic()
+        self._success_count = 0  # Number of successes in the history window
+        # No adjustments before this point in time
+        self._cooldown_until = time.monotonic() + adjustment_cooldown
 
         # Queue state
-        self._queue: asyncio.Queue[QueuedTask[T | Exception]] = asyncio.Queue()
+        # The worker is the only consumer, so a deque with a wake-up signal is
+        # enough and avoids the per-item futures of asyncio.Queue.
+        self._pending: Deque[QueuedTask[T | Exception]] = deque()
+        self._signal = asyncio.Event()
         self._worker_task: asyncio.Task[None] | None = None
+        # Calls started by the worker. The event loop only keeps weak references to
+        # tasks, so we hold on to them until they are done.
+        self._running: Set[asyncio.Task[None]] = set()
 
     async def _worker(self) -> None:
-        """Continuously process API call tasks from the queue in batches."""
+        """
+        Continuously start queued API calls as fast as the rate limit allows.
+        The worker only paces the starts. Each call runs in its own task, so slow
+        calls don't hold back the ones queued after them.
+        """
         while True:
-            tasks: List[QueuedTask[T | Exception]] = []
-
-            # Wait briefly for at least one task
+            # Block until there is work and the rate limit allows the next call.
+            # Cancellation propagates out of the loop.
             try:
-                task_item = await asyncio.wait_for(self._queue.get(), timeout=0.1)
-                tasks.append(task_item)
-            except asyncio.TimeoutError:
-                pass
+                await self._signal.wait()
+                await self._limiter.acquire()
             except asyncio.CancelledError:
                 self._logger.debug("Worker task cancelled")
-                return
+                raise
 
-            # Drain any other tasks that are immediately available
-            while not self._queue.empty():
-                tasks.append(self._queue.get_nowait())
+            # The worker is the only consumer, so the queue can't run empty while
+            # we wait for the limiter
+            task = self._pending.popleft()
+            if not self._pending:
+                self._signal.clear()
 
-            if tasks:
-                await self._run_tasks(tasks)
-            else:
-                # If no tasks, sleep briefly to avoid busy waiting
-                await asyncio.sleep(0.1)
-
-    async def _run_tasks(self, tasks: List[QueuedTask[T | Exception]]) -> None:
-        """Run a list of tasks in the queue. Assumes that the coroutines in tasks do
-        not throw exceptions.
-        This is important because we don't want to stop the whole batch if one of the
-        tasks fails. Instead, we want to handle the failure in the task itself and
-        continue with the rest of the tasks.
+            self._logger.debug(
+                f"Starting call at {self._current_rps} RPS, {len(self._running)} running"
+            )
+            running = asyncio.create_task(self._run_task(task))
+            self._running.add(running)
+            running.add_done_callback(self._running.discard)
+
+    async def _run_task(self, task: QueuedTask[T | Exception]) -> None:
+        """Run a single task and settle its future. Assumes that the coroutine of the
+        task does not throw exceptions. Failures are passed on to the caller through
+        the future, so they can be retried there.
         """
-        coros = [task.coroutine for task in tasks]
-        self._logger.debug(f"Processing {len(coros)} calls at {self._current_rps} RPS")
-
-        results = await aiometer.run_all(coros, max_per_second=self._current_rps)
-        # Set results and adjust rate limit based on success/failure
-        for task, result in zip(tasks, results, strict=False):
-            if not task.future.done():
-                if isinstance(result, Exception):
-                    task.future.set_exception(result)
-                    self._record_result(False)
-                else:
-                    task.future.set_result(result)
-                    self._record_result(True)
+        self._settle_task(task, await task.coroutine())
+
+    def _settle_task(
+        self, task: QueuedTask[T | Exception], result: T | Exception
+    ) -> None:
+        """Set the result of a task and adjust rate limit based on success/failure"""
+        if not task.future.done():
+            if isinstance(result, Exception):
+                task.future.set_exception(result)
+                self._record_result(False)
+            else:
+                task.future.set_result(result)
+                self._record_result(True)
 
     def _record_result(self, success: bool) -> None:
         """Record an API call result and potentially adjust the rate."""
+        # Keep the success count in sync with the window by subtracting the result
+        # that the bounded deque is about to evict.
+        if len(self._history) == self._window_size:
+            self._success_count -= self._history[0]
         self._history.append(success)
+        self._success_count += success
         self._maybe_adjust_rate()
 
     def _maybe_adjust_rate(self) -> None:
         """Adjust RPS if conditions warrant a change."""
-        if len(self._history) < self._window_size:
-            return
-
+        # Most results arrive during the cooldown, so check that first
         now = time.monotonic()
-        if (now - self._last_adjustment) < self._adjustment_cooldown:
+        if now < self._cooldown_until or len(self._history) < self._window_size:
             return
 
-        success_rate = sum(1 for x in self._history if x) / len(self._history)
+        success_rate = self._success_count / len(self._history)
         failure_rate = 1 - success_rate
 
         if failure_rate >= self._failure_threshold:
@@ -149,20 +203,22 @@ class RateLimitedQueue(Generic[T]):
         new_rps = max(self._min_rps, self._current_rps - self._adjustment_size)
         if new_rps != self._current_rps:
             self._current_rps = new_rps
+            self._limiter.rate = new_rps
             self._logger.warning(
                 f"High failure rate ({failure_rate:.1%}), reducing RPS to {new_rps:.1f}"
             )
-            self._last_adjustment = now
+            self._cooldown_until = now + self._adjustment_cooldown
 
     def _increase_rate(self, success_rate: float, now: float) -> None:
         """Increases rate limit by the specified adjustment size"""
         new_rps = min(self._max_rps, self._current_rps + self._adjustment_size)
         if new_rps != self._current_rps:
             self._current_rps = new_rps
+            self._limiter.rate = new_rps
             self._logger.info(
                 f"High success rate ({success_rate:.1%}), increasing RPS to {new_rps:.1f}"
             )
-            self._last_adjustment = now
+            self._cooldown_until = now + self._adjustment_cooldown
 
     async def enqueue(
         self,
@@ -185,28 +241,27 @@ class RateLimitedQueue(Generic[T]):
             self._logger.debug("Starting worker task")
             self._worker_task = asyncio.create_task(self._worker())
 
-        # We don't raise exceptions, so aiometer doesn't receive them. Otherwise, it
-        # would stop a complete task batch.
-        async def task_wrapper() -> T | Exception:
-            try:
-                return await api_call(*args)
-            except Exception as e:
-                return e
-
         loop = asyncio.get_running_loop()
-        task = QueuedTask(coroutine=task_wrapper, future=loop.create_future())
+        task = QueuedTask(
+            coroutine=functools.partial(_safe_call, api_call, args),
+            future=loop.create_future(),
+        )
 
-        # This is just for tracking in logs
-        id = str(uuid4())[:8]
+        # This is just for tracking in logs, so it doesn't need to be a real UUID
+        id = f"{random.getrandbits(32):08x}"
+        # Checked once, so API results aren't formatted when they aren't logged
+        debug = self._logger.isEnabledFor(logging.DEBUG)
 
         # Try the task until we get a result or hit the retry limit
         result: T | Exception | None = None
         while result is None and task.retry_count < self._max_retries:
             self._logger.debug(f"{id}: Enqueuing task for attempt {task.retry_count}")
-            await self._queue.put(task)
+            self._pending.append(task)
+            self._signal.set()
             try:
                 result = await task.future
-                self._logger.debug(f"{id}: Task result: {result}")
+                if debug:
+                    self._logger.debug(f"{id}: Task result: {result}")
             except Exception as error:
                 self._logger.warning(f"{id}: Exception in task: {error}")
                 task.retry_count += 1
@@ -217,7 +272,15 @@ class RateLimitedQueue(Generic[T]):
                     )
                     raise error
 
-                self._logger.info(f"{id}: Retrying. Attempt {task.retry_count}")
+                # Exponential backoff with full jitter, so failed calls don't retry
+                # in lockstep against a struggling API
+                delay = random.uniform(
+                    0, min(self._retry_cap, self._retry_base * 2**task.retry_count)
+                )
+                self._logger.info(
+                    f"{id}: Retrying in {delay:.2f}s. Attempt {task.retry_count}"
+                )
+                await asyncio.sleep(delay)
                 task.future = loop.create_future()
 
         # This actually should not occur here and is a safety measure (and fixes typing)
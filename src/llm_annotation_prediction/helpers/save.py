@@ -1,13 +1,19 @@
-import json
 from abc import ABC, abstractmethod
 from logging import getLogger
 from pathlib import Path
 from typing import Any, Dict, List
 
 import yaml
+from pydantic_core import to_json
 
 from llm_annotation_prediction.helpers.config import Config
 
+# Use the libyaml bindings if PyYAML was built with them
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+
 logger = getLogger("Results")
 
 
@@ -32,7 +38,12 @@ def save_results(folder: Path, config: Config, classes: List[Saveable]) -> None:
     Saves all results from classes implementing the corresponding method
     """
     with open(folder / "config.yaml", "w") as f:
-        yaml.safe_dump(config.model_dump(mode="json"), f)
+        yaml.dump(
+            config.model_dump(mode="json"),
+            f,
+            Dumper=_SafeDumper,
+            default_flow_style=False,
+        )
 
     for c in classes:
         if isinstance(c, Saveable):
@@ -46,5 +57,4 @@ def dump_to_json(path: Path, content: Dict[str, Any]) -> None:
     Helper to shorten and consolidate saving
     """
     logger.debug(f"Saving dict to {path}")
-    with open(path, "w") as f:
-        json.dump(content, f, indent=2)
+    path.write_bytes(to_json(content, indent=2))
@@ -1,4 +1,4 @@
-from datetime import datetime
+import time
 from logging import getLogger
 from pathlib import Path
 
@@ -20,7 +20,7 @@ def get_experiment_folder(folder_name: str) -> Path:
         Path: A Path object representing the experiment folder path with the current
             timestamp and sanitized folder name.
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     name = sanitize_folder_name(folder_name)
 
     return Path(f"{EXPERIMENT_FOLDER}/{timestamp}-{name}")
@@ -1,13 +1,16 @@
+import functools
 import importlib
 from typing import Any, Type, Union
 
 
+@functools.lru_cache(maxsize=None)
 def load_class(class_path: str) -> Type[Any]:
     """
     Dynamically loads a class from a given class path string.
 
     This function takes a fully qualified class path and returns the corresponding class object.
-    The class path should be relative to the top-level package.
+    The class path should be relative to the top-level package. Results are cached, so
+    reloaded modules require clearing the cache with `load_class.cache_clear()`.
 
     Args:
         class_path (str): A string representing the full path to the class,
@@ -1,9 +1,10 @@
-import json
+import importlib.util
 import logging
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict
 
 from pydantic import BaseModel
+from pydantic_core import from_json
 
 from llm_annotation_prediction.helpers.constants import (
     METADATA_FILENAME,
@@ -16,13 +17,22 @@ from llm_annotation_prediction.helpers.utils import get
 if TYPE_CHECKING:
     from docling.document_converter import DocumentConverter
 
-document_converter: "DocumentConverter | None"
-try:
-    from docling.document_converter import DocumentConverter
+# docling is optional and loads its models when the converter is created. Both are
+# deferred until a PDF actually needs to be converted.
+_docling_available = importlib.util.find_spec("docling") is not None
+_document_converter: "DocumentConverter | None" = None
+
+
+def _get_document_converter() -> "DocumentConverter":
+    """
+    Returns the shared docling converter and creates it on first use.
+    """
+    global _document_converter
+    if _document_converter is None:
+        from docling.document_converter import DocumentConverter
 
-    document_converter = DocumentConverter()
-except ImportError:
-    document_converter = None
+        _document_converter = DocumentConverter()
+    return _document_converter
 
 
 class PublicationConfig(BaseModel):
@@ -54,8 +64,8 @@ class Publication:
         self._logger.debug("Loading")
         loading_error = None
         try:
-            self.metadata = json.load(open(self._metadata_path, "r", encoding="utf8"))
-            self._paper_md = self._paper_md_path.read_text(encoding="utf-8")
+            self.metadata = from_json(self._metadata_path.read_bytes())
+            self._paper_md = self._paper_md_path.read_bytes().decode("utf-8")
         except Exception as error:
             loading_error = error
 
@@ -63,14 +73,19 @@ class Publication:
             if loading_error:
                 self._logger.error(f"Error while loading: {loading_error}")
                 raise loading_error
-            if not self.verify():
+            if not self.verify(metadata=self.metadata):
                 raise ValueError("Publication is not valid")
 
         self._loaded = True
 
-    def verify(self, warn_on_missing_supplementary: bool = False) -> bool:
+    def verify(
+        self,
+        warn_on_missing_supplementary: bool = False,
+        metadata: Dict[str, Any] | None = None,
+    ) -> bool:
         """
-        Verifies the existence of the publication files.
+        Verifies the existence of the publication files. Already parsed metadata can
+        be passed in to avoid reading the file again.
 
         Returns:
             bool: True if this publication is ready to be used in experiments.
@@ -79,12 +94,12 @@ class Publication:
         valid = True
 
         # Metadata is only loaded for verification; does not initialize publication
-        metadata = None
-        if not self._metadata_path.exists():
-            self._logger.error("Metadata file does not exist")
-            valid = False
-        else:
-            metadata = json.load(open(self._metadata_path, "r", encoding="utf8"))
+        if metadata is None:
+            if not self._metadata_path.exists():
+                self._logger.error("Metadata file does not exist")
+                valid = False
+            else:
+                metadata = from_json(self._metadata_path.read_bytes())
 
         if not self._paper_md_path.exists():
             valid = False
@@ -119,7 +134,7 @@ class Publication:
             )
             return
 
-        if not document_converter:
+        if not _docling_available:
             self._logger.error(
                 "docling is not installed. Install with 'uv sync --extra docling'."
             )
@@ -127,7 +142,7 @@ class Publication:
 
         self._logger.info("Converting PDF to Markdown")
         try:
-            result = document_converter.convert(self._paper_pdf_path)
+            result = _get_document_converter().convert(self._paper_pdf_path)
         except Exception as e:
             self._logger.error(f"Error while converting PDF: {e}")
             return
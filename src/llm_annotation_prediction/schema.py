@@ -1,13 +1,18 @@
-import json
 from dataclasses import dataclass
+from functools import cached_property
 from logging import getLogger
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, TypeAdapter
+from pydantic_core import from_json
 from referencing import Registry, Resource
 
-from llm_annotation_prediction.helpers.schema import match_gitlab_regex
+from llm_annotation_prediction.helpers.schema import (
+    FILE_GROUP,
+    OBJECT_GROUP,
+    match_gitlab_regex,
+)
 from llm_annotation_prediction.helpers.utils import get
 
 _logger = getLogger("Schema")
@@ -65,11 +70,21 @@ class OntologyLinkedEntity(BaseModel):
         Converts the entity to a markdown list entry with a given indentation.
         Appends a markdown list of its children with increased indentation.
         """
-        text = " " * indent + f"- {self.display}"
-        if self.children:
-            for child in self.children:
-                text += f"\n{child.to_markdown_string(indent + 2)}"
-        return text
+        lines: List[str] = []
+        self._append_markdown_lines(lines, indent)
+        return "\n".join(lines)
+
+    def _append_markdown_lines(self, lines: List[str], indent: int) -> None:
+        """
+        Appends the markdown list lines of the entity and its children. Uses a stack
+        instead of recursion, so the lines of large trees are only joined once.
+        """
+        stack = [(self, indent)]
+        while stack:
+            entity, level = stack.pop()
+            lines.append(f"{' ' * level}- {entity.display}")
+            if entity.children:
+                stack.extend((child, level + 2) for child in reversed(entity.children))
 
     @staticmethod
     def list_to_markdown_string(entity_list: list["OntologyLinkedEntity"]) -> str:
@@ -77,7 +92,10 @@ class OntologyLinkedEntity(BaseModel):
         Converts each entity in a list to a markdown list string and combines them
         to form a printable string.
         """
-        return "\n".join(entity.to_markdown_string() for entity in entity_list)
+        lines: List[str] = []
+        for entity in entity_list:
+            entity._append_markdown_lines(lines, 0)
+        return "\n".join(lines)
 
 
 @dataclass
@@ -93,6 +111,28 @@ class Reference:
 # Helper type to describe the extracted lists from the schema
 SchemaEntityCollection = dict[str, list[OntologyLinkedEntity]]
 
+# Result of extracting entities from a JSON object
+ExtractedEntities = OntologyLinkedEntity | List[OntologyLinkedEntity]
+
+# Extracts entities from a JSON object of a specific type
+Extractor = Callable[[Resource, Any, Optional[int]], ExtractedEntities]
+
+
+def _get_properties(obj: Any) -> Dict[str, Any] | None:
+    """
+    Returns the properties of a JSON schema object, if it has any.
+    """
+    properties = obj.get("properties") if isinstance(obj, dict) else None
+    return properties if isinstance(properties, dict) else None
+
+
+def _get_const(properties: Dict[str, Any], name: str) -> Any | None:
+    """
+    Returns the constant value of a property, if it has one.
+    """
+    value = properties.get(name)
+    return value.get("const") if isinstance(value, dict) else None
+
 
 class Schema:
     """
@@ -109,6 +149,28 @@ class Schema:
     def __init__(self, config: SchemaConfig):
         self._config: SchemaConfig = config
 
+        # Parsed JSON only contains exact built-in types, so we can pick the extractor
+        # by type instead of going through isinstance checks
+        self._extractors: Dict[type, Extractor] = {
+            # For lists, we look up every entry
+            list: self._extract_list_items,
+            # If we encounter a dictionary, it should be an ontology entity or
+            # reference one
+            dict: self._extract_from_dict,
+            str: self._extract_string,
+        }
+
+        # Schema files don't change while the collection is built and the same files,
+        # pointers and sub-trees are referenced many times. These caches are keyed by
+        # object ids, which stay valid because the loaded files are kept alive by
+        # `_resources`.
+        self._resources: Dict[Path, Resource] = {}
+        # References are resolved within a loaded file, so an empty, immutable
+        # registry is all we need and can be shared
+        self._resolver = Registry().resolver()
+        self._references: Dict[Tuple[int, str], Reference] = {}
+        self._extracted: Dict[Tuple[int, int, Optional[int]], ExtractedEntities] = {}
+
         if config.load_collection_from_file is not None:
             self._entity_collection = self._load_collection(
                 config.load_collection_from_file
@@ -123,10 +185,11 @@ class Schema:
                     Path(config.save_collection_to_file), self._entity_collection
                 )
 
-    @property
+    @cached_property
     def collection(self) -> Dict[str, str]:
         """
-        Returns the collection as a dict of stringified markdown lists.
+        Returns the collection as a dict of stringified markdown lists. The entities
+        don't change after loading, so the lists are only rendered once.
         """
         return {
             k: OntologyLinkedEntity.list_to_markdown_string(v)
@@ -138,10 +201,9 @@ class Schema:
         Loads and validates the entities from a JSON file.
         """
         _logger.info(f"Loading schema from {file_path}")
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-
-        collection = self._entity_collection_adapter.validate_json(content)
+        collection = self._entity_collection_adapter.validate_json(
+            file_path.read_bytes()
+        )
         return collection
 
     def _save_collection(
@@ -155,8 +217,7 @@ class Schema:
         content_bytes = Schema._entity_collection_adapter.dump_json(
             entity_collection, indent=4, exclude_none=True
         )
-        with open(file_path, "w", encoding="utf-8") as file:
-            file.write(content_bytes.decode("utf-8"))
+        file_path.write_bytes(content_bytes)
 
     def _load_schema_file(self, file_path: str) -> Resource:
         """
@@ -168,9 +229,11 @@ class Schema:
             )
 
         full_path = self._config.schema_folder / Path(file_path)
-        with open(full_path, "r", encoding="utf-8") as file:
-            content = json.load(file)
-        return Resource.from_contents(content)
+        resource = self._resources.get(full_path)
+        if resource is None:
+            resource = Resource.from_contents(from_json(full_path.read_bytes()))
+            self._resources[full_path] = resource
+        return resource
 
     def _validate_schema_folder(self, folder: Optional[Path]) -> None:
         """
@@ -196,7 +259,14 @@ class Schema:
         Builds the configured collection of entity lists from the schema.
         """
         _logger.info("Building all entity lists from schema")
-        return {e.name: self._build_entity_list(e) for e in entity_lists}
+        collection = {e.name: self._build_entity_list(e) for e in entity_lists}
+
+        # The caches are only needed while building
+        self._resources.clear()
+        self._references.clear()
+        self._extracted.clear()
+
+        return collection
 
     def _build_entity_list(
         self, list_ref: EntityListReference
@@ -229,15 +299,20 @@ class Schema:
         """
         match = match_gitlab_regex(target)
 
-        file_path = match.group("file")
+        file_path = match.group(FILE_GROUP)
         if file_path:
             resource = self._load_schema_file(file_path)
 
         if resource is None:
             raise TypeError(f"No resource found or provided for reference {target}")
 
-        resolved = resource.pointer(match.group("object"), Registry().resolver())
-        return Reference(resource, resolved.contents)
+        pointer = match.group(OBJECT_GROUP)
+        reference = self._references.get((id(resource), pointer))
+        if reference is None:
+            resolved = resource.pointer(pointer, self._resolver)
+            reference = Reference(resource, resolved.contents)
+            self._references[(id(resource), pointer)] = reference
+        return reference
 
     def _resolve_reference_object(
         self, resource: Resource, obj: Any
@@ -256,27 +331,42 @@ class Schema:
 
     def _extract_entities(
         self, resource: Resource, obj: Any, depth: Optional[int] = None
-    ) -> OntologyLinkedEntity | List[OntologyLinkedEntity]:
+    ) -> ExtractedEntities:
         """
         Recursively extracts ontology-linked entitites while resolving references.
         If depth is specified, the recursive lookup level for entities can be limited.
         This limit concerns the submenus of entities, not the JSON structure.
-        """
-        _logger.debug(f"Extracting entities in {obj} with depth: {depth}")
 
-        # For lists, we look up every entry
-        if isinstance(obj, list):
-            return self._extract_list_items(resource, obj, depth)
+        Results are cached, so sub-trees that are referenced several times are only
+        extracted once.
+        """
+        key = (id(resource), id(obj), depth)
+        entities = self._extracted.get(key)
+        if entities is None:
+            entities = self._extract_uncached_entities(resource, obj, depth)
+            self._extracted[key] = entities
+        return entities
 
-        # If we encounter a dictionary, it should be an ontology entity or reference one
-        if isinstance(obj, dict):
-            return self._extract_from_dict(resource, obj, depth)
+    def _extract_uncached_entities(
+        self, resource: Resource, obj: Any, depth: Optional[int] = None
+    ) -> ExtractedEntities:
+        """
+        Extracts the entities of a JSON object depending on its type.
+        """
+        _logger.debug(f"Extracting entities in {obj} with depth: {depth}")
 
-        # Allow regular string entries (from enums) as well for now.
-        if isinstance(obj, str):
-            return OntologyLinkedEntity(display=obj)
+        extractor = self._extractors.get(type(obj))
+        if extractor is None:
+            raise ValueError(f"Unexpected content: {obj}")
+        return extractor(resource, obj, depth)
 
-        raise ValueError(f"Unexpected content: {obj}")
+    def _extract_string(
+        self, resource: Resource, obj: str, depth: Optional[int] = None
+    ) -> OntologyLinkedEntity:
+        """
+        Allow regular string entries (from enums) as well for now.
+        """
+        return OntologyLinkedEntity(display=obj)
 
     def _extract_list_items(
         self, resource: Resource, obj: List[Any], depth: Optional[int] = None
@@ -286,6 +376,13 @@ class Schema:
         """
         _logger.debug("Extracting list")
 
+        # Enums are often plain lists of strings. Those don't need the recursive lookup.
+        # Some enums contain null values, which we need to ignore.
+        if all(item is None or type(item) is str for item in obj):
+            return [
+                OntologyLinkedEntity(display=item) for item in obj if item is not None
+            ]
+
         entities = []
         for item in obj:
             # Some enums contain null values, which we need to ignore
@@ -299,7 +396,7 @@ class Schema:
 
     def _extract_from_dict(
         self, resource: Resource, obj: Any, depth: Optional[int] = None
-    ) -> OntologyLinkedEntity | List[OntologyLinkedEntity]:
+    ) -> ExtractedEntities:
         """
         Extract all entities from a dictionary or follow compositions and references to
         find more.
@@ -320,10 +417,13 @@ class Schema:
             return entity
 
         # If this is neither a reference nor a an entity, try if we have a composition
-        for property in ["anyOf", "oneOf", "enum"]:
-            composition = get(obj, property)
-            if composition is not None:
-                return self._extract_entities(resource, composition, depth)
+        composition = obj.get("anyOf")
+        if composition is None:
+            composition = obj.get("oneOf")
+        if composition is None:
+            composition = obj.get("enum")
+        if composition is not None:
+            return self._extract_entities(resource, composition, depth)
 
         # Last possibility is the now deprecated select-or-other schem with allOf
         allOf = get(obj, "allOf")
@@ -343,16 +443,20 @@ class Schema:
         _logger.debug(f"Extracting entity in {obj}")
 
         # If we can't find the key or display, it's not an ontology entry and we can quit
-        key = get(obj, "properties", "key", "const")
-        display = get(obj, "properties", "display", "const")
+        properties = _get_properties(obj)
+        if properties is None:
+            _logger.debug("No entity found")
+            return None
 
+        key = _get_const(properties, "key")
+        display = _get_const(properties, "display")
         if key is None or display is None:
             _logger.debug("No entity found")
             return None
 
         # Unfortunately there seems to be an inconsistency with the spelling of classUri
-        if not (uri := get(obj, "properties", "classURI", "const")):
-            uri = get(obj, "properties", "classUri", "const")
+        if not (uri := _get_const(properties, "classURI")):
+            uri = _get_const(properties, "classUri")
 
         return OntologyLinkedEntity(key=key, display=display, uri=uri)
 
@@ -384,12 +488,13 @@ class Schema:
         """
         _logger.debug(f"Looking for submenu in {obj}")
 
-        key = get(obj, "properties", "key", "const")
-        if key is None:
+        properties = _get_properties(obj)
+        key = _get_const(properties, "key") if properties is not None else None
+        if properties is None or key is None:
             _logger.error(f"Object is not an ontology entity: {obj}")
             return None
 
-        return get(obj, "properties", key)
+        return properties.get(key)
 
     def _decrease_depth(self, depth: Optional[int]) -> int | None:
         """
@@ -9,12 +9,15 @@ then timed out.
 
 import argparse
 import asyncio
-import io
+import os
 import shutil
 import subprocess
 import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+
+from rich.console import Console
 
 from llm_annotation_prediction.evaluation.conversation_evaluator import (
     ConversationEvaluatorConfig,
@@ -26,9 +29,13 @@ from llm_annotation_prediction.evaluation.multi_experiment_evaluator import (
     MultiExperimentEvaluator,
     MultiExperimentEvaluatorConfig,
 )
-from llm_annotation_prediction.helpers.constants import Context, Conversation
+from llm_annotation_prediction.helpers.constants import (
+    CONTEXT_FILENAME,
+    Context,
+    Conversation,
+)
 from llm_annotation_prediction.tools.show import (
-    console,
+    create_console,
     evaluate_context,
     load_conversations,
     load_data,
@@ -39,10 +46,17 @@ chrome = (
     shutil.which("google-chrome") or shutil.which("chrome") or shutil.which("chromium")
 )
 
+# Each rendering experiment keeps all of its data and conversations in memory, so only
+# a few are loaded at the same time. Their trials still feed plenty of PDF conversions.
+MAX_CONCURRENT_EXPERIMENTS = 2
 
-def html_to_pdf(input_html: str, output_pdf: str) -> None:
+
+async def html_to_pdf(
+    input_html: str, output_pdf: str, pdf_limit: asyncio.Semaphore
+) -> None:
     """
-    Convert an HTML file to a PDF using Google Chrome in headless mode.
+    Convert an HTML file to a PDF using Google Chrome in headless mode. The semaphore
+    limits how many Chrome processes run at the same time.
     """
     if not chrome:
         raise FileNotFoundError("Could not find Chrome/Chromium on your PATH")
@@ -55,10 +69,30 @@ def html_to_pdf(input_html: str, output_pdf: str) -> None:
         Path(input_html).absolute().as_uri(),
     ]
 
-    try:
-        subprocess.run(args, check=True, timeout=60)
-    except subprocess.TimeoutExpired:
-        print(f"Timeout converting {input_html} to PDF.", file=sys.stderr)
+    # Chrome runs as an async subprocess, so other trials can render in the meantime
+    async with pdf_limit:
+        process = await asyncio.create_subprocess_exec(*args)
+        try:
+            await asyncio.wait_for(process.wait(), timeout=60)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            print(f"Timeout converting {input_html} to PDF.", file=sys.stderr)
+            return
+
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode or 0, args)
+
+
+@contextmanager
+def _recording_console() -> Iterator[Console]:
+    """
+    Creates a console that records its output, so it can be saved as HTML. The text
+    it renders for the terminal is never read, so it's discarded right away instead
+    of being kept in memory.
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        yield create_console(devnull)
 
 
 def get_experiment_folders(containing_folder: Path) -> List[Path]:
@@ -68,11 +102,22 @@ def get_experiment_folders(containing_folder: Path) -> List[Path]:
     return [f for f in containing_folder.iterdir() if f.is_dir()]
 
 
+def _get_experiment_size(experiment: Path) -> int:
+    """
+    Estimates the rendering work of an experiment by the size of its context file.
+    """
+    try:
+        return (experiment / CONTEXT_FILENAME).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
 async def _render_single_evaluation(
     context: Context,
     title: str,
     out_folder: Path,
     detailed: bool,
+    pdf_limit: asyncio.Semaphore,
     overwrite: bool = False,
 ) -> None:
     """
@@ -83,21 +128,23 @@ async def _render_single_evaluation(
     pdf_file = out_folder / f"eval_{suffix}.pdf"
 
     if overwrite or not (html_file.exists() and pdf_file.exists()):
-        await evaluate_context(
-            context=context,
-            title=title,
-            verify_pubtator_ids=True,
-            disable_description=not detailed,
-            disable_elements=not detailed,
-        )
-        console.save_html(str(html_file))
+        with _recording_console() as console:
+            await evaluate_context(
+                context=context,
+                title=title,
+                verify_pubtator_ids=True,
+                disable_description=not detailed,
+                disable_elements=not detailed,
+                console=console,
+            )
+            console.save_html(str(html_file))
     else:
         print(f"Skipping {suffix} evaluation for '{title}' (HTML already exists).")
 
     if overwrite or not pdf_file.exists():
         if chrome:
             try:
-                html_to_pdf(str(html_file), str(pdf_file))
+                await html_to_pdf(str(html_file), str(pdf_file), pdf_limit)
                 print(f"Generated PDF: {pdf_file}")
                 html_file.unlink()
             except Exception as e:
@@ -109,7 +156,11 @@ async def _render_single_evaluation(
 
 
 async def render_evaluation(
-    context: Context, title: str, out_folder: Path, overwrite: bool = False
+    context: Context,
+    title: str,
+    out_folder: Path,
+    pdf_limit: asyncio.Semaphore,
+    overwrite: bool = False,
 ) -> None:
     """Renders both short and detailed evaluations of a single trial"""
     print(f"Rendering evaluation for '{title}'")
@@ -118,6 +169,7 @@ async def render_evaluation(
         title=title,
         out_folder=out_folder,
         detailed=False,
+        pdf_limit=pdf_limit,
         overwrite=overwrite,
     )
     await _render_single_evaluation(
@@ -125,27 +177,33 @@ async def render_evaluation(
         title=title,
         out_folder=out_folder,
         detailed=True,
+        pdf_limit=pdf_limit,
         overwrite=overwrite,
     )
 
 
-def render_conversation(
-    conversation: Conversation, title: str, out_folder: Path, overwrite: bool = False
+async def render_conversation(
+    conversation: Conversation,
+    title: str,
+    out_folder: Path,
+    pdf_limit: asyncio.Semaphore,
+    overwrite: bool = False,
 ) -> None:
     """Renders a conversation to HTML and PDF"""
     html_file = out_folder / "conversation.html"
     pdf_file = out_folder / "conversation.pdf"
 
     if overwrite or not (html_file.exists() and pdf_file.exists()):
-        for message in conversation:
-            print_message(message)
-        console.save_html(str(html_file))
+        with _recording_console() as console:
+            for message in conversation:
+                print_message(message, console=console)
+            console.save_html(str(html_file))
     else:
         print(f"Skipping conversation for '{title}' (HTML already exists).")
 
     if overwrite or not pdf_file.exists():
         if chrome:
-            html_to_pdf(str(html_file), str(pdf_file))
+            await html_to_pdf(str(html_file), str(pdf_file), pdf_limit)
             try:
                 html_file.unlink()
             except Exception as e:
@@ -156,41 +214,71 @@ def render_conversation(
         )
 
 
+async def _render_trial(
+    context: Context,
+    conversation: Conversation,
+    title: str,
+    out_folder: Path,
+    pdf_limit: asyncio.Semaphore,
+    overwrite: bool = False,
+) -> None:
+    """Renders the evaluations and the conversation of a single trial"""
+    await render_evaluation(
+        context=context,
+        title=title,
+        out_folder=out_folder,
+        pdf_limit=pdf_limit,
+        overwrite=overwrite,
+    )
+    await render_conversation(
+        conversation=conversation,
+        title=title,
+        out_folder=out_folder,
+        pdf_limit=pdf_limit,
+        overwrite=overwrite,
+    )
+
+
 async def render_experiment(
-    experiment: Path, out_folder: Path, overwrite: bool = False
+    experiment: Path,
+    out_folder: Path,
+    pdf_limit: asyncio.Semaphore,
+    experiment_limit: asyncio.Semaphore,
+    overwrite: bool = False,
 ) -> None:
     """Renders all trials in an experiment"""
-    print(f"Rendering experiment '{experiment}'")
-    data = load_data(str(experiment))
-    conversations = load_conversations(str(experiment))
-
-    # Conversations and Data should have the same keys
-    for uuid, trials in data.items():
-        print(f"Rendering {uuid}: {len(trials)} trials")
-
-        trial_folder = out_folder / uuid
-        for trial_index, context in enumerate(trials):
-            if len(trials) > 1:
-                trial_folder = trial_folder / f"trial_{str(trial_index)}"
-            trial_folder.mkdir(exist_ok=True)
-            title = f"'{uuid}' (Trial {trial_index})"
-
-            # We have to run all rendering sequentially, because we use a single console
-            # from "show.py". Could be improved by using a different console for each trial.
-            await render_evaluation(
-                context=context,
-                title=title,
-                out_folder=trial_folder,
-                overwrite=overwrite,
-            )
-
-            trial_conversation = conversations[uuid][trial_index]
-            render_conversation(
-                conversation=trial_conversation,
-                title=title,
-                out_folder=trial_folder,
-                overwrite=overwrite,
-            )
+    async with experiment_limit:
+        print(f"Rendering experiment '{experiment}'")
+        # Loading is blocking, so it runs in a thread to keep the other renders going
+        data = await asyncio.to_thread(load_data, str(experiment))
+        conversations = await asyncio.to_thread(load_conversations, str(experiment))
+
+        # Every trial renders to its own console, so they can run concurrently
+        renders = []
+
+        # Conversations and Data should have the same keys
+        for uuid, trials in data.items():
+            print(f"Rendering {uuid}: {len(trials)} trials")
+
+            for trial_index, context in enumerate(trials):
+                trial_folder = out_folder / uuid
+                if len(trials) > 1:
+                    trial_folder = trial_folder / f"trial_{str(trial_index)}"
+                trial_folder.mkdir(parents=True, exist_ok=True)
+                title = f"'{uuid}' (Trial {trial_index})"
+
+                renders.append(
+                    _render_trial(
+                        context=context,
+                        conversation=conversations[uuid][trial_index],
+                        title=title,
+                        out_folder=trial_folder,
+                        pdf_limit=pdf_limit,
+                        overwrite=overwrite,
+                    )
+                )
+
+        await asyncio.gather(*renders)
 
 
 async def render_all_experiments(
@@ -198,13 +286,33 @@ async def render_all_experiments(
 ) -> None:
     """Renders all experiments in a folder"""
     print(f"Rendering all experiments in '{in_folder}' to '{out_folder}'")
-    experiments = get_experiment_folders(in_folder)
+    # Larger experiments start first, so they don't end up as the last ones running
+    experiments = sorted(
+        get_experiment_folders(in_folder), key=_get_experiment_size, reverse=True
+    )
 
+    # Trials can render concurrently, except for Chrome. Each process is heavy, so we
+    # only run about one per CPU. Experiments are limited, so that not all of them are
+    # in memory at once.
+    pdf_limit = asyncio.Semaphore(os.cpu_count() or 4)
+    experiment_limit = asyncio.Semaphore(MAX_CONCURRENT_EXPERIMENTS)
+
+    renders = []
     for experiment in experiments:
         out_experiment = out_folder / experiment.name
         out_experiment.mkdir(exist_ok=True)
 
-        await render_experiment(experiment, out_experiment, overwrite=overwrite)
+        renders.append(
+            render_experiment(
+                experiment,
+                out_experiment,
+                pdf_limit,
+                experiment_limit,
+                overwrite=overwrite,
+            )
+        )
+
+    await asyncio.gather(*renders)
 
 
 async def plot(in_folder: Path, out_folder: Path) -> None:
@@ -282,7 +390,6 @@ def main() -> None:
             "HTML output will not be converted to PDF."
         )
 
-    console.file = io.StringIO()
     in_folder = Path(args.input)
 
     out_folder = Path(args.output)
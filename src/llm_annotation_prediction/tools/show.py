@@ -4,16 +4,21 @@ Helper tool to show conversations and evaluations from experiments.
 
 import argparse
 import asyncio
+import itertools
+import mmap
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Generic, List, Optional, Tuple, cast, overload
+from typing import IO, Any, Dict, Generic, List, Optional, Tuple, cast, overload
 
-from rich.console import Console, RenderableType
+from pydantic_core import from_json
+from rich.console import Console, Group, RenderableType
 from rich.markdown import Markdown
 from rich.padding import Padding
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
 
 from llm_annotation_prediction.evaluation.conversation_evaluator import (
     ConversationEvaluator,
@@ -24,6 +29,7 @@ from llm_annotation_prediction.helpers.constants import (
     CONVERSATIONS_FILENAME,
     Context,
     Conversation,
+    ConversationAdapter,
     Conversations,
     ConversationsAdapter,
     Data,
@@ -35,7 +41,16 @@ from llm_annotation_prediction.helpers.logging import LOG_FILENAME
 from llm_annotation_prediction.helpers.open_router import Message, UserMessage
 from llm_annotation_prediction.helpers.setup import EXPERIMENT_FOLDER
 
-console = Console(width=100, record=True)
+
+def create_console(file: IO[str] | None = None) -> Console:
+    """
+    Creates a console for the output of this tool. It records everything it prints,
+    so the output can be saved as HTML.
+    """
+    return Console(width=100, record=True, file=file)
+
+
+console = create_console()
 
 
 @dataclass
@@ -53,27 +68,24 @@ def get_latest_experiment_folder() -> Optional[str]:
     """
     Retrieves the folder with the latest experiment.
     """
-    folders = [
-        f
-        for f in os.listdir(EXPERIMENT_FOLDER)
-        if os.path.isdir(os.path.join(EXPERIMENT_FOLDER, f))
-    ]
-    if not folders:
+    # Directory entries already know their type, so this doesn't need a stat per entry.
+    # Folder names start with a timestamp, so the largest name is the latest experiment.
+    with os.scandir(EXPERIMENT_FOLDER) as entries:
+        latest = max((entry.name for entry in entries if entry.is_dir()), default=None)
+    if latest is None:
         print("Error: No experiments found")
         exit(1)
-    return os.path.join(EXPERIMENT_FOLDER, sorted(folders)[-1])
+    return os.path.join(EXPERIMENT_FOLDER, latest)
 
 
-def load_conversations(experiment_folder: str) -> Conversations:
+def _read_conversations_file(experiment_folder: str) -> bytes:
     """
-    Loads the conversations from the respective JSON in the experiment.
+    Reads the JSON file with the conversations of the experiment.
     """
     print(f"Loading experiment in {experiment_folder}")
     try:
         conversations_path = Path(experiment_folder) / CONVERSATIONS_FILENAME
-        conversations = ConversationsAdapter.validate_json(
-            open(conversations_path, encoding="utf-8").read()
-        )
+        return conversations_path.read_bytes()
     except FileNotFoundError:
         print(
             (
@@ -82,7 +94,25 @@ def load_conversations(experiment_folder: str) -> Conversations:
             )
         )
         exit(1)
-    return conversations
+
+
+def load_conversations(experiment_folder: str) -> Conversations:
+    """
+    Loads the conversations from the respective JSON in the experiment.
+    """
+    return ConversationsAdapter.validate_json(
+        _read_conversations_file(experiment_folder)
+    )
+
+
+def load_raw_conversations(experiment_folder: str) -> ExperimentData[Any]:
+    """
+    Parses the conversations from the respective JSON in the experiment, but doesn't
+    validate them. The trials are plain JSON lists.
+    """
+    return cast(
+        ExperimentData[Any], from_json(_read_conversations_file(experiment_folder))
+    )
 
 
 def _index_trials(data: ExperimentData[T]) -> List[Tuple[str, int]]:
@@ -137,7 +167,7 @@ def _get_trial_by_uuid(data: ExperimentData[T], trial_id: str) -> TrialEntry[T]:
     """
     Returns a trial when a UUID is provided. Uses "_i" suffix for trial index.
     """
-    n_trials = len(list(data.values())[0])
+    n_trials = len(next(iter(data.values())))
     id_parts = trial_id.split("_")
 
     try:
@@ -209,8 +239,14 @@ def get_conversation(
     Returns the conversation which is either specified by index or by UUID
     (with potential suffix) in `conversation_id`.
     """
-    conversations = load_conversations(experiment_folder)
-    return get_trial(conversations, conversation_id, title="Available conversations")
+    # Only the requested conversation is validated. Picking it just needs the UUIDs
+    # and the number of trials, which the raw JSON already has.
+    conversations = load_raw_conversations(experiment_folder)
+    trial_entry = get_trial(
+        conversations, conversation_id, title="Available conversations"
+    )
+    trial_entry.trial = ConversationAdapter.validate_python(trial_entry.trial)
+    return trial_entry
 
 
 def _get_number_of_tool_calls(message: Message) -> int:
@@ -224,22 +260,34 @@ def _get_number_of_tool_calls(message: Message) -> int:
     return 0
 
 
-def print_message(message: Message) -> None:
+def _format_message(message: Message) -> RenderableType:
     """
-    Pretty prints a provided message.
+    Builds the renderable for a message: a header with the role and the padded content.
     """
-    console.print(Panel(f"[bold]{message.role.capitalize()}[/bold]:"))
+    header = Panel(f"[bold]{message.role.capitalize()}[/bold]:")
 
     text = str(message.content)
     n_tool_calls = _get_number_of_tool_calls(message)
-    if not text and n_tool_calls > 0:
-        text = f"[{message.role.capitalize()} answered with {n_tool_calls} tool calls]"
 
-    formatted: RenderableType = Markdown(text)
+    formatted: RenderableType
+    if not text and n_tool_calls > 0:
+        # Our own placeholder has no markup, so it doesn't need the Markdown parser
+        formatted = Text(
+            f"[{message.role.capitalize()} answered with {n_tool_calls} tool calls]"
+        )
+    else:
+        formatted = Markdown(text)
     formatted = Panel(formatted)
     formatted = Padding(formatted, (0, 0, 0, 4))
 
-    console.print(formatted)
+    return Group(header, formatted)
+
+
+def print_message(message: Message, console: Console = console) -> None:
+    """
+    Pretty prints a provided message.
+    """
+    console.print(_format_message(message))
 
 
 def show_conversation(
@@ -258,8 +306,8 @@ def show_conversation(
     console.print(
         f"Showing conversation '{trial_entry.uuid} (Trial {trial_entry.trial_index})':"
     )
-    for message in conversation:
-        print_message(message)
+    # A single print writes the whole conversation at once instead of per message
+    console.print(Group(*(_format_message(message) for message in conversation)))
 
 
 def show_message(
@@ -274,17 +322,40 @@ def show_message(
         return
 
     conversation = trial_entry.trial
-    messages = [m for m in conversation if m.role == role]
-    n_messages = len(messages)
+    messages = (m for m in conversation if m.role == role)
 
-    if -n_messages - 1 < message_index < n_messages:
-        print_message(messages[message_index])
+    # Positive indices only need to walk the conversation up to the requested message.
+    # Negative ones need the full list anyway.
+    message: Optional[Message] = None
+    if message_index >= 0:
+        message = next(itertools.islice(messages, message_index, None), None)
     else:
+        role_messages = list(messages)
+        if -message_index <= len(role_messages):
+            message = role_messages[message_index]
+
+    if message is not None:
+        print_message(message)
+    else:
+        n_messages = sum(1 for m in conversation if m.role == role)
         print(
             f"Error: Prompt index {message_index} is out of bounds for {n_messages} {role} messages"
         )
 
 
+# Matches the ERROR level column and the rest of the line, for both log formats. The
+# DEBUG format has an additional "file:line" column before the message. Starting with
+# a literal lets the regex engine skip quickly to the candidates.
+_ERROR_LEVEL = re.compile(rb"\| ERROR *\|([^|\n]*)\|(?:([^|\n:]*:\d+ *)\|)?([^\n]*)")
+
+
+def _decode(column: bytes) -> str:
+    """
+    Decodes a matched log column and strips the padding.
+    """
+    return column.decode("utf-8", errors="replace").strip()
+
+
 def show_errors(experiment_folder: str) -> None:
     """Shows all ERROR level log messages from the experiment log."""
 
@@ -293,11 +364,21 @@ def show_errors(experiment_folder: str) -> None:
         print(f"Error: Log file not found in {experiment_folder}")
         return
 
-    error_entries = []
-    with open(log_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if "| ERROR" in line:
-                error_entries.append(line.strip())
+    # The file is only mapped, so the regex can scan the whole log in one go without
+    # reading it into memory line by line. Empty files can't be mapped.
+    error_entries: List[Tuple[bytes, bytes, Optional[bytes], bytes]] = []
+    if log_path.stat().st_size > 0:
+        with (
+            open(log_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log,
+        ):
+            for match in _ERROR_LEVEL.finditer(log):
+                line_start = log.rfind(b"\n", 0, match.start()) + 1
+                timestamp = log[line_start : match.start()]
+                # Only the level column counts, not "| ERROR" inside of a message
+                if b"|" not in timestamp:
+                    name, location, message = match.groups()
+                    error_entries.append((timestamp, name, location, message))
 
     if not error_entries:
         console.print("[green]No errors found in the log.[/green]")
@@ -308,35 +389,26 @@ def show_errors(experiment_folder: str) -> None:
     table.add_column("Logger")
     table.add_column("Message")
 
-    for entry in error_entries:
-        # Split by '|' and strip whitespace
-        parts = [p.strip() for p in entry.split("|")]
-        if len(parts) >= 4:
-            timestamp = parts[0]
+    for timestamp, name, location, message in error_entries:
+        logger = _decode(name)
+        if location is not None:  # DEBUG log level has an extra column
+            logger = f"{logger}({_decode(location)})"
 
-            if len(parts) == 5:  # DEBUG log level has 5 cols
-                logger = f"{parts[2]}({parts[3]})"
-                message = parts[4]
-            else:
-                logger = parts[2]
-                message = parts[3]
-
-            table.add_row(timestamp, logger, message)
+        table.add_row(_decode(timestamp), logger, _decode(message))
 
     error_console = Console(width=160)
     error_console.print()
     error_console.print(table)
 
 
-def load_data(experiment_folder: str) -> Data:
+def _read_data_file(experiment_folder: str) -> bytes:
     """
-    Loads the context data from the respective JSON in the experiment.
+    Reads the JSON file with the context data of the experiment.
     """
     print(f"Loading experiment in {experiment_folder}")
     try:
         context_path = Path(experiment_folder) / CONTEXT_FILENAME
-        with open(context_path, encoding="utf-8") as f:
-            context = DataAdapter.validate_json(f.read())
+        return context_path.read_bytes()
     except FileNotFoundError:
         print(
             (
@@ -345,7 +417,21 @@ def load_data(experiment_folder: str) -> Data:
             )
         )
         exit(1)
-    return context
+
+
+def load_data(experiment_folder: str) -> Data:
+    """
+    Loads the context data from the respective JSON in the experiment.
+    """
+    return DataAdapter.validate_json(_read_data_file(experiment_folder))
+
+
+def load_raw_data(experiment_folder: str) -> ExperimentData[Any]:
+    """
+    Parses the context data from the respective JSON in the experiment, but doesn't
+    validate it.
+    """
+    return cast(ExperimentData[Any], from_json(_read_data_file(experiment_folder)))
 
 
 async def evaluate_context(
@@ -354,19 +440,39 @@ async def evaluate_context(
     verify_pubtator_ids: bool = True,
     disable_elements: bool = False,
     disable_description: bool = False,
+    console: Console = console,
 ) -> None:
     """
     Prints the evaluation statistics of the context.
     """
+    table = await _evaluate_context_to_table(
+        context,
+        title,
+        verify_pubtator_ids=verify_pubtator_ids,
+        disable_elements=disable_elements,
+        disable_description=disable_description,
+    )
+    console.print(table)
+
+
+async def _evaluate_context_to_table(
+    context: Context,
+    title: str,
+    verify_pubtator_ids: bool = True,
+    disable_elements: bool = False,
+    disable_description: bool = False,
+) -> RenderableType:
+    """
+    Evaluates the context and returns the rendered statistics.
+    """
     config = ConversationEvaluatorConfig(verify_pubtator_ids=verify_pubtator_ids)
     evaluator = ConversationEvaluator(config, context)
     await evaluator.evaluate()
-    table = evaluator.print_to_table(
+    return evaluator.print_to_table(
         title=title,
         show_elements=not disable_elements,
         show_description=not disable_description,
     )
-    console.print(table)
 
 
 async def evaluate_experiment(
@@ -380,28 +486,40 @@ async def evaluate_experiment(
     """
     Prints the evaluation statistics of the experiment.
     """
+    if not show_all and trial_id is None:
+        # Listing the trials only needs the keys, so the data isn't validated
+        _show_trial_keys(
+            load_raw_data(experiment_folder), title="Available evaluations"
+        )
+        exit(1)
+
     data = load_data(experiment_folder)
 
-    settings = {
+    settings: Dict[str, Any] = {
         "verify_pubtator_ids": verify_pubtator_ids,
         "disable_elements": disable_elements,
         "disable_description": disable_description,
     }
 
     if show_all:
-        for uuid, trials in data.items():
-            for index, trial in enumerate(trials):
-                title = f"'{uuid}' (Trial {index})"
-                await evaluate_context(trial, title, **settings)
-
-    if not show_all:
-        if trial_id is None:
-            _show_trial_keys(data, title="Available evaluations")
-            exit(1)
-        else:
-            trial_entry = get_trial(data, trial_id)
-            title = f"'{trial_entry.uuid}' (Trial {trial_entry.trial_index})"
-            await evaluate_context(trial_entry.trial, title, **settings)
+        # The trials are independent, so their Pubtator lookups can overlap. The
+        # Pubtator rate limiter still caps the requests. Gather keeps the order of the
+        # tables.
+        tables = await asyncio.gather(
+            *(
+                _evaluate_context_to_table(
+                    trial, f"'{uuid}' (Trial {index})", **settings
+                )
+                for uuid, trials in data.items()
+                for index, trial in enumerate(trials)
+            )
+        )
+        for table in tables:
+            console.print(table)
+    else:
+        trial_entry = get_trial(data, trial_id)
+        title = f"'{trial_entry.uuid}' (Trial {trial_entry.trial_index})"
+        await evaluate_context(trial_entry.trial, title, **settings)
 
 
 def main() -> None:
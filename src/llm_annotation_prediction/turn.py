@@ -47,8 +47,10 @@ class Turn:
         Apply all request handlers to translate the configured features
         into a request object.
         """
-        _logger.debug("Preparing request")
+        if not self._request_handlers:
+            return request_dto
 
+        _logger.debug("Preparing request")
         for handler in self._request_handlers:
             request_dto = await handler.handle_request(request_dto, is_tool_cycle)
         return request_dto
@@ -60,6 +62,9 @@ class Turn:
         Apply all response handlers to extract or transform information from the LLM
         response.
         """
+        if not self._response_handlers:
+            return response_dto
+
         _logger.debug("Parsing response")
         for handler in self._response_handlers:
             response_dto = await handler.handle_response(response_dto, is_tool_cycle)